@@ -4,6 +4,31 @@ from collections import deque
 from flask import current_app
 from flask_frozen import UrlForLogger, Freezer
 
+
+class UrlsToFreeze:
+    """A queue of absolute URLs to freeze, each URL is queued only once.
+
+    Content from cache and from forks records the same URLs over and over
+    (e.g. links to static files), the duplicates would only be yielded
+    to the freezer again.
+    """
+
+    def __init__(self):
+        self.queue = deque()
+        self.seen = set()
+
+    def __bool__(self):
+        return bool(self.queue)
+
+    def append(self, url):
+        if url not in self.seen:
+            self.seen.add(url)
+            self.queue.append(url)
+
+    def popleft(self):
+        return self.queue.popleft()
+
+
 def record_url(url):
     """Logs that `url` should be included in the resulting static site"""
     urls_to_freeze = current_app.config.get('NAUCSE_ABSOLUTE_URLS_TO_FREEZE')
@@ -56,7 +81,7 @@ class NaucseFreezer(Freezer):
     def __init__(self, app):
         super().__init__(app)
 
-        urls_to_freeze = deque()
+        urls_to_freeze = UrlsToFreeze()
 
         with app.app_context():
             app.config['NAUCSE_ABSOLUTE_URLS_TO_FREEZE'] = urls_to_freeze
@@ -14,7 +14,7 @@ from git import Repo
 import naucse.utils.views
 from naucse.utils.models import Model, YamlProperty, DataProperty, DirProperty, MultipleModelDirProperty, ForkProperty
 from naucse.utils.models import reify, arca
-from naucse.validation import AllowedElementsParser
+from naucse.validation import get_allowed_elements_parser
 from naucse.templates import setup_jinja_env, vars_functions
 from naucse.utils.markdown import convert_markdown
 from naucse.utils.notebook import convert_notebook
@@ -22,7 +22,6 @@ from pathlib import Path
 
 
 _TIMEZONE = 'Europe/Prague'
-allowed_elements_parser = AllowedElementsParser()
 
 
 class Lesson(Model):
@@ -589,6 +588,11 @@ def optional_convert_time(timestr):
         return None
 
 
+class NoCalendar(Exception):
+    """Raised when a calendar of a course without dates is requested.
+    """
+
+
 class CourseLink(CourseMixin, Model):
     """A link to a course from a separate git repo.
     """
@@ -641,17 +645,28 @@ class CourseLink(CourseMixin, Model):
                           reference=Path("."), depth=None)
 
         if page_type != "calendar_ics" and result.output["content"] is not None:
-            allowed_elements_parser.reset_and_feed(result.output["content"])
+            get_allowed_elements_parser().reset_and_feed(result.output["content"])
 
         return result.output
 
     def render_course(self, **kwargs):
         return self.render("course", **kwargs)
 
+    def _raise_if_no_calendar(self):
+        """Raise :class:`NoCalendar` if the course has no dates, without running a task in the fork.
+
+        Only runs have dates, forks don't return ``start_date`` for courses (see ``Course.COURSE_INFO``),
+        so calendars of linked courses are never rendered.
+        """
+        if self.start_date is None:
+            raise NoCalendar(f"Course {self.slug} doesn't have any dates, it doesn't have a calendar.")
+
     def render_calendar(self, **kwargs):
+        self._raise_if_no_calendar()
         return self.render("calendar", **kwargs)
 
     def render_calendar_ics(self, **kwargs):
+        self._raise_if_no_calendar()
         return self.render("calendar_ics", **kwargs)
 
     def render_page(self, lesson_slug, page, solution, content_key=None, **kwargs):
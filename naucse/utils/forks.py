@@ -21,16 +21,24 @@ def get_course_from_slug(slug: str) -> Course:
         return views.model.runs[(int(parts[0]), parts[1])]
 
 
-def course_info(slug: str, *args, **kwargs) -> Dict[str, Any]:
-    """Return info about the given course.
-
-    Return some extra info when it's a run (based on COURSE_INFO/RUN_INFO)
+def _resolve_course(slug: str) -> Course:
+    """ Gets the course instance from a slug, refusing links to other forks.
     """
     course = get_course_from_slug(slug)
 
     if course.is_link():
         raise ValueError("Circular dependency.")
 
+    return course
+
+
+def course_info(slug: str, *args, **kwargs) -> Dict[str, Any]:
+    """Return info about the given course.
+
+    Return some extra info when it's a run (based on COURSE_INFO/RUN_INFO)
+    """
+    course = _resolve_course(slug)
+
     if "course" in slug:
         attributes = Course.COURSE_INFO
     else:
@@ -64,10 +72,7 @@ def serialize_license(license) -> Optional[Dict[str, str]]:
 def render(page_type: str, slug: str, *args, **kwargs) -> Dict[str, Any]:
     """Return a rendered page for a course, based on page_type and slug.
     """
-    course = get_course_from_slug(slug)
-
-    if course.is_link():
-        raise ValueError("Circular dependency.")
+    course = _resolve_course(slug)
 
     path = []
     if kwargs.get("request_url"):
@@ -161,12 +166,16 @@ def render(page_type: str, slug: str, *args, **kwargs) -> Dict[str, Any]:
                         "slug": session.slug,
                     }
 
-                prev_link, session_link, next_link = views.get_footer_links(course, session, prv, nxt, lesson_url)
-                info["footer"] = {
-                    "prev_link": prev_link,
-                    "session_link": session_link,
-                    "next_link": next_link
-                }
+                # callers which only need the content can skip building the footer,
+                # the URLs the footer links to aren't recorded for freezing then
+                if not kwargs.get("skip_footer"):
+                    prev_link, session_link, next_link = views.get_footer_links(course, session, prv, nxt,
+                                                                                lesson_url)
+                    info["footer"] = {
+                        "prev_link": prev_link,
+                        "session_link": session_link,
+                        "next_link": next_link
+                    }
 
             elif page_type == "session_coverpage":
                 session_slug, coverpage, *_ = args
@@ -197,10 +206,7 @@ def render(page_type: str, slug: str, *args, **kwargs) -> Dict[str, Any]:
 
 
 def get_footer_links(slug, lesson_slug, page, request_url=None):
-    course = get_course_from_slug(slug)
-
-    if course.is_link():
-        raise ValueError("Circular dependency.")
+    course = _resolve_course(slug)
 
     try:
         lesson = views.model.get_lesson(lesson_slug)
@@ -1,10 +1,14 @@
 """Functions for validation and further processing of metadata from forks.
 """
+from functools import lru_cache
 from xml.dom import SyntaxErr
 
 from naucse.models import Page
 from naucse.validation import DisallowedStyle
 
+# pages of the same lesson usually share the same css, don't parse it repeatedly
+_limit_css_cached = lru_cache(maxsize=512)(Page.limit_css_to_lesson_content)
+
 
 class InvalidInfo(Exception):
     pass
@@ -68,7 +72,7 @@ def process_page_data(page):
 
     if page["css"]:
         try:
-            Page.limit_css_to_lesson_content(page["css"])
+            _limit_css_cached(page["css"])
         except SyntaxErr:
             raise DisallowedStyle(DisallowedStyle.COULD_NOT_PARSE)
 
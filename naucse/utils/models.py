@@ -1,3 +1,4 @@
+import os
 from collections import OrderedDict
 from pathlib import Path
 
@@ -7,6 +8,11 @@ from werkzeug.local import LocalProxy
 
 import naucse.utils.views
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
 _arca = None
 
 
@@ -54,6 +60,10 @@ class LazyProperty:
     Subclasses should reimplement a `compute` method, which creates
     the value of the property. Then the value is stored and not computed again
     (unless deleted).
+
+    The value is stored in the instance ``__dict__``; since this is
+    a non-data descriptor, later lookups find it there and don't call
+    :meth:`__get__` at all.
     """
     def __set_name__(self, cls, name):
         self.name = name
@@ -61,8 +71,7 @@ class LazyProperty:
     def __get__(self, instance, cls):
         if instance is None:
             return self
-        result = self.compute(instance)
-        setattr(instance, self.name, result)
+        result = instance.__dict__[self.name] = self.compute(instance)
         return result
 
     def compute(self, instance):
@@ -82,7 +91,7 @@ class YamlProperty(LazyProperty):
         if filename is None:
             filename = self.name + '.yml'
         with instance.path.joinpath(filename).open(encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_Loader)
 
 
 class ForkProperty(LazyProperty):
@@ -97,16 +106,16 @@ class ForkProperty(LazyProperty):
     def __init__(self, repo, branch, **kwargs):
         self.repo_prop = repo
         self.branch_prop = branch
-        self.kwargs = kwargs
 
-    def process_kwargs(self, instance):
-        x = {}
+        # which values need to be called is known upfront
+        self.static_kwargs = {key: value for key, value in kwargs.items() if not callable(value)}
+        self.dynamic_kwargs = [(key, value) for key, value in kwargs.items() if callable(value)]
 
-        for key, value in self.kwargs.items():
-            if callable(value):
-                value = value(instance)
+    def process_kwargs(self, instance):
+        x = dict(self.static_kwargs)
 
-            x[key] = value
+        for key, func in self.dynamic_kwargs:
+            x[key] = func(instance)
 
         return x
 
@@ -154,6 +163,27 @@ class DataProperty:
         return self.convert(val)
 
 
+_order_cache = {}
+
+
+def _load_order(info_path):
+    """Return the ``order`` list from an ``info.yml`` file.
+
+    The parsed list is kept until the file is modified, so models which are
+    recreated for every request (in debug mode) don't parse it again.
+    """
+    mtime = info_path.stat().st_mtime_ns
+    cached = _order_cache.get(info_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with info_path.open(encoding='utf-8') as f:
+        order = yaml.load(f, Loader=_Loader)['order']
+
+    _order_cache[info_path] = (mtime, order)
+    return order
+
+
 class DirProperty(LazyProperty):
     """Ordered dict of models from a subdirectory
 
@@ -174,10 +204,14 @@ class DirProperty(LazyProperty):
 
         info_path = base.joinpath("info.yml")
         if info_path.is_file():
-            with info_path.open(encoding='utf-8') as f:
-                model_paths = [base.joinpath(p) for p in yaml.safe_load(f)['order']]
+            model_paths = [base.joinpath(p) for p in _load_order(info_path)]
+
+        # DirEntry.is_dir uses the file type from the directory listing, no extra stat is needed
+        with os.scandir(str(base)) as entries:
+            subdirectory_names = sorted(entry.name for entry in entries if entry.is_dir())
 
-        remaining_subdirectories = [p for p in sorted(base.iterdir()) if p.is_dir() and p not in model_paths]
+        ordered_paths = set(model_paths)
+        remaining_subdirectories = [base / name for name in subdirectory_names if base / name not in ordered_paths]
 
         return model_paths + remaining_subdirectories
 
@@ -2,7 +2,6 @@ import datetime
 import hashlib
 import json
 import os
-from collections import defaultdict
 from pathlib import Path
 
 from arca.exceptions import PullError, BuildError, RequirementsMismatch
@@ -21,9 +20,12 @@ def get_recent_runs(course):
         today = datetime.date.today()
         cutoff = today - datetime.timedelta(days=2*30)
         this_year = today.year
+        # ``base_course`` of a link is read from the fork, so it can only be
+        # checked after ``does_course_return_info`` confirms the fork works
+        include_links = forks_enabled()
         for year, run_year in reversed(course.root.run_years.items()):
             for run in run_year.runs.values():
-                if not run.is_link() or (forks_enabled() and does_course_return_info(run, ["start_date", "end_date"])):
+                if not run.is_link() or (include_links and does_course_return_info(run, ["start_date", "end_date"])):
                     if run.base_course is course and run.end_date > cutoff:
                         recent_runs.append(run)
 
@@ -42,16 +44,28 @@ def list_months(start_date, end_date):
 
     The months of start_date and end_date are both included.
     """
-    months = []
-    year = start_date.year
-    month = start_date.month
-    while (year, month) <= (end_date.year, end_date.month):
-        months.append((year, month))
-        month += 1
-        if month > 12:
-            month = 1
-            year += 1
-    return months
+    # months counted from year 0, so the year and month are just divmod by 12
+    start = start_date.year * 12 + start_date.month - 1
+    end = end_date.year * 12 + end_date.month - 1
+    return [(month // 12, month % 12 + 1) for month in range(start, end + 1)]
+
+
+_caching_enabled_flag = None
+
+
+def _caching_enabled():
+    """Return true if values computed from git can be kept between requests.
+
+    That's not the case in debug mode, where the content can change while
+    the app is running. The config is only read on the first call.
+    """
+    global _caching_enabled_flag
+
+    if _caching_enabled_flag is None:
+        from naucse.views import app
+        _caching_enabled_flag = not app.config['DEBUG']
+
+    return _caching_enabled_flag
 
 
 _naucse_tree_hash = {}
@@ -62,7 +76,6 @@ def get_naucse_tree_hash(repo):
 
     The ``naucse`` tree contains rendering mechanisms.
     """
-    from naucse.views import app
     global _naucse_tree_hash
 
     if _naucse_tree_hash.get(repo.git_dir):
@@ -70,35 +83,80 @@ def get_naucse_tree_hash(repo):
 
     tree_hash = get_hash_for_file(repo, "naucse")
 
-    if not app.config['DEBUG']:
+    if _caching_enabled():
         _naucse_tree_hash[repo.git_dir] = tree_hash
 
     return tree_hash
 
 
-_lesson_tree_hash = defaultdict(dict)
+_worktree_root = {}
+
+
+def _worktree(repo):
+    """Return the path to the working tree of ``repo``.
+    """
+    # ``repo.git_dir`` is path to the ``.git`` folder
+    try:
+        return _worktree_root[repo.git_dir]
+    except KeyError:
+        root = _worktree_root[repo.git_dir] = Path(repo.git_dir).parent
+        return root
+
+
+# keyed by ``(repo.git_dir, lesson_slug)``
+_lesson_tree_hash = {}
+_lesson_tree_hash_primed = set()
+_missing_lessons = set()
+
+
+def _prime_lesson_tree_hashes(repo):
+    """Store hashes of all lesson trees in ``repo``, using a single git call.
+    """
+    _lesson_tree_hash_primed.add(repo.git_dir)
+
+    for entry in repo.git.ls_tree("-r", "-d", "-z", "HEAD", "lessons").split("\0"):
+        if not entry:
+            continue
+
+        info, path = entry.split("\t", 1)
+        parts = path.split("/")
+
+        # only ``lessons/<collection>/<lesson>``, not the collections or subfolders of lessons
+        if len(parts) == 3:
+            _lesson_tree_hash[(repo.git_dir, f"{parts[1]}/{parts[2]}")] = info.split()[2]
 
 
 def get_lesson_tree_hash(repo, lesson_slug):
     """Return the hash of the tree containing the lesson in specified repo.
     """
-    from naucse.views import app
+    key = (repo.git_dir, lesson_slug)
 
-    global _lesson_tree_hash
+    tree_hash = _lesson_tree_hash.get(key)
+    if tree_hash is not None:
+        return tree_hash
 
-    if lesson_slug in _lesson_tree_hash[repo.git_dir]:
-        return _lesson_tree_hash[repo.git_dir][lesson_slug]
+    if key in _missing_lessons:
+        raise FileNotFoundError
 
-    # ``repo.git_dir`` is path to the ``.git`` folder
-    if not (Path(repo.git_dir).parent / "lessons" / lesson_slug).exists():
+    if not (_worktree(repo) / "lessons" / lesson_slug).exists():
+        if _caching_enabled():
+            _missing_lessons.add(key)
         raise FileNotFoundError
 
-    commit = get_hash_for_file(repo, "lessons/" + lesson_slug)
+    # hashes of all lessons will be needed when freezing, get them at once
+    if _caching_enabled() and repo.git_dir not in _lesson_tree_hash_primed:
+        _prime_lesson_tree_hashes(repo)
 
-    if not app.config['DEBUG']:
-        _lesson_tree_hash[repo.git_dir][lesson_slug] = commit
+        tree_hash = _lesson_tree_hash.get(key)
+        if tree_hash is not None:
+            return tree_hash
 
-    return commit
+    tree_hash = get_hash_for_file(repo, "lessons/" + lesson_slug)
+
+    if _caching_enabled():
+        _lesson_tree_hash[key] = tree_hash
+
+    return tree_hash
 
 
 def forks_enabled():
@@ -178,13 +236,22 @@ def does_course_return_info(course, extra_required=(), *, force_ignore=False):
     return False
 
 
+_page_content_cache_keys = {}
+
+
 def page_content_cache_key(repo, lesson_slug, page, solution, course_vars=None) -> str:
     """Return a key under which content fragments will be stored in cache
 
     The cache key depends on the page and the last commit which modified
     lesson rendering in ``repo``
     """
-    return "commit:{}:content:{}".format(
+    # vars are compared the way they end up in the key, e.g. ``True`` and ``1`` are different
+    memo_key = (repo.git_dir, lesson_slug, page, solution, json.dumps(course_vars, sort_keys=True))
+    if memo_key in _page_content_cache_keys:
+        return _page_content_cache_keys[memo_key]
+
+    # forks compute the key with their own copy of this function, the payload must stay the same
+    key = "commit:{}:content:{}".format(
         get_naucse_tree_hash(repo),
         hashlib.sha1(json.dumps(
             {
@@ -198,6 +265,11 @@ def page_content_cache_key(repo, lesson_slug, page, solution, course_vars=None)
         ).encode("utf-8")).hexdigest()
     )
 
+    if _caching_enabled():
+        _page_content_cache_keys[memo_key] = key
+
+    return key
+
 
 def edit_link(path):
     from naucse.views import model
@@ -1,3 +1,5 @@
+import re
+import threading
 from xml.dom import SyntaxErr
 
 from html.parser import HTMLParser
@@ -24,6 +26,28 @@ class DisallowedStyle(Exception):
     OUT_OF_SCOPE = _BASE + " Rendered page contains a style that modifies something else."
 
 
+#: Prefixes of CSS selectors allowed in <style> elements
+#: (the space is important, only descendants of these elements can be styled)
+_ALLOWED_SELECTOR_PREFIXES = (".dataframe ",)
+
+#: Pieces of the rules generated by the notebook converter, e.g.
+#: ``.dataframe thead tr:only-child th { text-align: right; }``.
+#: Styles made only of such rules are checked without cssutils, anything else goes to the parser.
+#: The pieces never overlap, so a failed match doesn't backtrack much on long input.
+_CSS_IDENT = r"-?[a-zA-Z_][a-zA-Z0-9_-]*"
+_CSS_SIMPLE_SELECTOR = rf"(?:[a-zA-Z][a-zA-Z0-9-]*|\.{_CSS_IDENT})(?::[a-zA-Z][a-zA-Z-]*)?"
+_CSS_SELECTOR = rf"\.dataframe(?: +{_CSS_SIMPLE_SELECTOR})+"
+_CSS_VALUE = rf"(?:#[0-9a-fA-F]+|(?:\d+(?:\.\d+)?|\.\d+)(?:%|[a-z]+)?|{_CSS_IDENT})"
+_CSS_DECLARATION = rf"[a-zA-Z-]+ *: *{_CSS_VALUE}(?: +{_CSS_VALUE})*"
+_SIMPLE_CSS_RULE_RE = re.compile(
+    rf"\s*({_CSS_SELECTOR}(?: *, *{_CSS_SELECTOR})*) *"
+    rf"\{{\s*(?:{_CSS_DECLARATION} *;\s*)*(?:{_CSS_DECLARATION}\s*)?\}}\s*"
+)
+
+# the parser doesn't keep any state between ``parseString`` calls, so it can be shared
+_CSS_PARSER = cssutils.CSSParser(raiseExceptions=True)
+
+
 class AllowedElementsParser(HTMLParser):
     """
     This parser is used on all HTML returned from forked repositories.
@@ -35,48 +59,48 @@ class AllowedElementsParser(HTMLParser):
       different than ``.dataframe`` elements.
     """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.css_parser = cssutils.CSSParser(raiseExceptions=True)
+    #: Set of allowed HTML elements
+    #: It has been compiled out of elements currently used in canonical lessons
+    allowed_elements = frozenset({
+        # functional:
+        'a', 'abbr', 'audio', 'img', 'source',
 
-        #: Set of allowed HTML elements
-        #: It has been compiled out of elements currently used in canonical lessons
-        self.allowed_elements = {
-            # functional:
-            'a', 'abbr', 'audio', 'img', 'source',
+        # styling:
+        'big', 'blockquote', 'code', 'font', 'i', 'tt', 'kbd', 'u', 'var', 'small', 'em', 'strong', 'sub',
 
-            # styling:
-            'big', 'blockquote', 'code', 'font', 'i', 'tt', 'kbd', 'u', 'var', 'small', 'em', 'strong', 'sub',
+        # formatting:
+        'br', 'div', 'hr', 'p', 'pre', 'span',
 
-            # formatting:
-            'br', 'div', 'hr', 'p', 'pre', 'span',
+        # lists:
+        'dd', 'dl', 'dt', 'li', 'ul', 'ol',
 
-            # lists:
-            'dd', 'dl', 'dt', 'li', 'ul', 'ol',
+        # headers:
+        'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
 
-            # headers:
-            'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+        # tables:
+        'table', 'tbody', 'td', 'th', 'thead', 'tr',
 
-            # tables:
-            'table', 'tbody', 'td', 'th', 'thead', 'tr',
+        # icons:
+        'svg', 'circle', 'path',
 
-            # icons:
-            'svg', 'circle', 'path',
+        # A special check is applied in :meth:`AllowedElementsParser.handle_data` method
+        # (only ``.dataframe`` styles allowed, generated from notebook converter)
+        'style',
+    })
 
-            # A special check is applied in :meth:`handle_data` method
-            # (only ``.dataframe`` styles allowed, generated from notebook converter)
-            'style',
-        }
+    #: Set of allowed HTML attributes
+    #: Compiled out of currently used in canonical lesson
+    allowed_attributes = frozenset({
+        'alt', 'aria-hidden', 'border', 'class', 'color', 'colspan', 'controls', 'cx', 'cy', 'd', 'halign', 'href',
+        'id', 'r', 'rowspan', 'src', 'start', 'title', 'type', 'valign', 'viewbox',
 
-        #: Set of allowed HTML attributes
-        #: Compiled out of currently used in canonical lesson
-        self.allowed_attributes = {
-            'alt', 'aria-hidden', 'border', 'class', 'color', 'colspan', 'controls', 'cx', 'cy', 'd', 'halign', 'href',
-            'id', 'r', 'rowspan', 'src', 'start', 'title', 'type', 'valign', 'viewbox',
+        # inline styles generated from notebook converter
+        'style',
+    })
 
-            # inline styles generated from notebook converter
-            'style',
-        }
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.css_parser = _CSS_PARSER
 
         self.attrs = set()
 
@@ -116,12 +140,38 @@ class AllowedElementsParser(HTMLParser):
         self.feed(data)
 
     def allow_selector(self, selector: str):
-        if not selector.startswith(".dataframe "):
-            return False
+        return selector.startswith(_ALLOWED_SELECTOR_PREFIXES)
+
+    def is_simple_allowed_css(self, data):
+        """Return true if ``data`` only contains simple rules with allowed selectors.
+        """
+        position = 0
+
+        while position < len(data):
+            match = _SIMPLE_CSS_RULE_RE.match(data, position)
+            if match is None:
+                return False
+
+            if not all(self.allow_selector(selector.strip()) for selector in match.group(1).split(",")):
+                return False
+
+            position = match.end()
 
         return True
 
     def validate_css(self, data):
+        # text following a </style> tag is passed here as well, usually just whitespace
+        if not data.strip():
+            return
+
+        # none of the selectors can be allowed, no need to parse the styles
+        # (styles without any ``{`` still go to the parser, ``@import`` rules don't have one)
+        if "{" in data and ".dataframe" not in data:
+            raise DisallowedStyle(DisallowedStyle.OUT_OF_SCOPE)
+
+        if self.is_simple_allowed_css(data):
+            return
+
         try:
             parsed_css = self.css_parser.parseString(data)
         except SyntaxErr:
@@ -134,3 +184,17 @@ class AllowedElementsParser(HTMLParser):
                         for rule in parsed_css.cssRules
                         for selector in rule.selectorList]):
                 raise DisallowedStyle(DisallowedStyle.OUT_OF_SCOPE)
+
+
+_parser_local = threading.local()
+
+
+def get_allowed_elements_parser():
+    """Return an :class:`AllowedElementsParser` to be reused in the current thread.
+
+    Use :meth:`AllowedElementsParser.reset_and_feed` to check HTML with it.
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = AllowedElementsParser()
+    return parser
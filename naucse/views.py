@@ -17,7 +17,6 @@ from werkzeug.local import LocalProxy
 
 from naucse import models
 from naucse.freezer import temporary_url_for_logger, record_url
-from naucse.models import allowed_elements_parser
 from naucse.templates import setup_jinja_env, vars_functions
 from naucse.urlconverters import register_url_converters
 from naucse.utils import links
@@ -28,7 +27,7 @@ from naucse.utils.views import get_recent_runs, list_months
 from naucse.utils.views import does_course_return_info
 from naucse.utils.views import raise_errors_from_forks
 from naucse.utils.views import page_content_cache_key, get_edit_info
-from naucse.validation import DisallowedStyle, DisallowedElement, InvalidHTML
+from naucse.validation import DisallowedStyle, DisallowedElement, InvalidHTML, get_allowed_elements_parser
 
 # so it can be mocked
 import naucse.utils.views
@@ -333,7 +332,7 @@ def course(course):
         }
     else:
         content = course_content(course)
-        allowed_elements_parser.reset_and_feed(content)
+        get_allowed_elements_parser().reset_and_feed(content)
 
         kwargs = {
             "course_content": content,
@@ -636,7 +635,7 @@ def course_page(course, lesson, page, solution=None):
             lesson, page, solution, course=course, lesson_url=lesson_url, subpage_url=subpage_url, static_url=static_url
         )
         content = content["content"]
-        allowed_elements_parser.reset_and_feed(content)
+        get_allowed_elements_parser().reset_and_feed(content)
         title = '{}: {}'.format(course.title, page.title)
 
         kwargs["edit_info"] = get_edit_info(page.edit_path)
@@ -677,7 +676,7 @@ def lesson(lesson, page, solution=None):
                            static_url=static_url)
 
     content = content["content"]
-    allowed_elements_parser.reset_and_feed(content)
+    get_allowed_elements_parser().reset_and_feed(content)
 
     kwargs = {}
     if solution is not None:
@@ -778,7 +777,7 @@ def session_coverpage(course, session, coverpage):
         session = course.sessions.get(session)
 
         content = session_coverpage_content(course, session, coverpage)
-        allowed_elements_parser.reset_and_feed(content)
+        get_allowed_elements_parser().reset_and_feed(content)
 
         kwargs = {
             "course": course,
@@ -818,6 +817,8 @@ def course_calendar(course):
 
             if content is None:
                 raise InvalidInfo("Content of the page can't be None.")
+        except models.NoCalendar:
+            abort(404)
         except POSSIBLE_FORK_EXCEPTIONS as e:
             if raise_errors_from_forks():
                 raise
@@ -843,7 +844,7 @@ def course_calendar(course):
             abort(404)
 
         content = course_calendar_content(course)
-        allowed_elements_parser.reset_and_feed(content)
+        get_allowed_elements_parser().reset_and_feed(content)
 
         kwargs = {
             "course": course,
@@ -0,0 +1,166 @@
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from naucse import models
+
+# what ``yaml.dump(..., default_flow_style=False)`` emits for the course and run info,
+# only the titles differ between the forks
+COURSE_YAML = """\
+description: Course description
+long_description: Course long description
+plan:
+- materials:
+  - lesson: beginners/cmdline
+  - lesson: beginners/install
+  slug: first-session
+  title: First session
+- materials:
+  - lesson: beginners/first-steps
+  - lesson: beginners/install-editor
+  slug: second-session
+  title: Second session
+title: {title}
+vars:
+  coach-present: false
+  some-var: true
+"""
+
+RUN_YAML = """\
+default_time:
+  end: '20:00'
+  start: '18:00'
+description: Run description
+long_description: Run long description
+plan:
+- date: 2018-02-06
+  materials:
+  - lesson: beginners/cmdline
+  - lesson: beginners/install
+  slug: first-session
+  title: First session
+- date: 2018-02-08
+  materials:
+  - lesson: beginners/first-steps
+  - lesson: beginners/install-editor
+  slug: second-session
+  title: Second session
+title: {title}
+vars:
+  coach-present: true
+  some-var: false
+"""
+
+
+@pytest.fixture(scope="session")
+def fork(tmpdir_factory):
+    """Generate a local fork of the current state of naucse for testing.
+
+    1) Copies the entire local state of naucse (without the git history) into a new repository
+    2) Adds one working course and one working run
+    3) Commits everything on branch ``test_branch``
+    4) Adds one more course and one more run, but breaks all rendering
+    5) Commits the broken state on ``test_broken_branch``
+
+    The fork lives in a temporary directory managed by pytest, which removes old ones.
+    """
+
+    # create a fork on a branch ``test_branch``
+    # hidden files are left out, except for the ones starting with ``.g`` or ``.t`` (``.gitignore``, ``.travis.yml``)
+    ignore = shutil.ignore_patterns(".[!gt]*", ".git", ".tox", "_build", "__pycache__")
+
+    test_dir = Path(str(tmpdir_factory.mktemp("fork"))) / "naucse"
+    naucse = Path(__file__).parent.parent
+    shutil.copytree(naucse, str(test_dir), ignore=ignore)
+
+    # the history isn't needed, a new repository is much cheaper than copying ``.git``
+    repo = Repo.init(str(test_dir))
+    branch = "test_branch"
+    repo.git.checkout(b=branch)
+
+    # one working course
+    course_info = test_dir / "courses/test-course/info.yml"
+    course_info.parent.mkdir(exist_ok=True, parents=True)
+    course_info.write_text(COURSE_YAML.format(title="Course title"))
+
+    # one working run
+    run_info = test_dir / "runs/2018/test-run/info.yml"
+    run_info.parent.mkdir(exist_ok=True, parents=True)
+    run_info.write_text(RUN_YAML.format(title="Run title"))
+
+    # commit everything
+    repo.git.add(A=True)
+    repo.index.commit("Commited everything")
+
+    # a broken branch for error handling testing
+    # the branch points to the commit just made, so only HEAD needs to move, no checkout
+    repo.head.reference = repo.create_head("test_broken_branch")
+
+    course_broken_info = test_dir / "courses/test-broken-course/info.yml"
+    course_broken_info.parent.mkdir(exist_ok=True, parents=True)
+    course_broken_info.write_text(COURSE_YAML.format(title="Broken course title"))
+
+    run_broken_info = test_dir / "runs/2018/test-broken-run/info.yml"
+    run_broken_info.parent.mkdir(exist_ok=True, parents=True)
+    run_broken_info.write_text(RUN_YAML.format(title="Broken run title"))
+
+    utils = test_dir / "naucse/utils" / "forks.py"
+    utils.write_text("")
+
+    # only a few files, add them in-process instead of running ``git add``
+    index = repo.index
+    index.add([str(course_broken_info), str(run_broken_info), str(utils)])
+    index.commit("Created duplicates in a different branch, but broke rendering")
+
+    return f"file://{test_dir}"
+
+
+@pytest.fixture(scope="session")
+def model(fork):
+    """Generate a Root instance with the courses and runs generated in ``fork``
+    """
+    path = Path(__file__).parent / 'fixtures/test_content'
+    root = models.Root(path)
+
+    course = models.CourseLink(root, path / 'courses/test-course')
+    course.repo = fork
+    course.branch = 'test_branch'
+
+    course_broken = models.CourseLink(root, path / 'courses/test-broken-course')
+    course_broken.repo = fork
+    course_broken.branch = 'test_broken_branch'
+
+    run = models.CourseLink(root, path / 'runs/2018/test-run')
+    run.repo = fork
+    run.branch = 'test_branch'
+
+    run_broken = models.CourseLink(root, path / 'runs/2018/test-broken-run')
+    run_broken.repo = fork
+    run_broken.branch = 'test_broken_branch'
+
+    # so rendering still works
+    meta = models.Course(root, path / 'courses/normal-course')
+    meta.is_meta = True
+
+    # so no file operations are needed, override list of courses and runs as well
+
+    root.courses = {'test-course': course,
+                    'test-broken-course': course_broken,
+                    'meta': meta}
+
+    run_year = models.RunYear(root, path / 'runs/2018')
+    run_year.runs = {
+        "test-run": run,
+        "test-broken-run": run_broken
+    }
+
+    # stays an OrderedDict, ``get_recent_runs`` iterates over the years in reverse
+    root.run_years = OrderedDict([
+        (2018, run_year)
+    ])
+    root.runs = {(2018, "test-run"): run, (2018, "test-broken-run"): run_broken}
+
+    return root
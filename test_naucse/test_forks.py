@@ -1,179 +1,31 @@
 import datetime
-import shutil
-import tempfile
-from collections import OrderedDict
-from pathlib import Path
+from unittest import mock
 
 import pytest
-import yaml
 from arca.exceptions import BuildError
 from flask.testing import FlaskClient
-from git import Repo
 
-from naucse import models
+from naucse.models import NoCalendar
 from naucse.utils.views import page_content_cache_key
 from naucse.utils.models import arca
-
-
-def generate_info(title, course_type, coach_present, some_var):
-    return {
-        "title": title,
-        "description": f"{course_type} description",
-        "long_description": f"{course_type} long description",
-        "vars": {
-            "coach-present": coach_present,
-            "some-var": some_var
-        },
-        "plan": [
-            {"title": "First session",
-             "slug": "first-session",
-             "materials": [
-                 {"lesson": "beginners/cmdline"},
-                 {"lesson": "beginners/install"},
-             ]},
-            {"title": "Second session",
-             "slug": "second-session",
-             "materials": [
-                 {"lesson": "beginners/first-steps"},
-                 {"lesson": "beginners/install-editor"},
-             ]},
-        ]
-    }
-
-
-def generate_course(title):
-    return generate_info(title, "Course", False, True)
-
-
-def generate_run(title):
-    run = generate_info(title, "Run", True, False)
-    run["default_time"] = {
-        "start": "18:00",
-        "end": "20:00"
-    }
-    run["plan"][0]["date"] = datetime.date(2018, 2, 6)
-    run["plan"][1]["date"] = datetime.date(2018, 2, 8)
-
-    return run
+from naucse.views import app
 
 
 @pytest.fixture(scope="module")
-def fork():
-    """Generate a local fork of the current state of naucse for testing.
-
-    1) Copies the entire local state of naucse
-    2) Adds one working course and one working run
-    3) Commits everything on branch ``test_branch``
-    4) Adds one more course and one more run, but breaks all rendering
-    5) Commits the broken state on ``test_broken_branch``
-    6) Deletes the fork once pytest finishes using this fixture
-    """
-
-    # create a fork on a branch ``test_branch``
-    def ignore(_, names):
-        return [x for x in names
-                if ((x.startswith(".") and x not in {".git", ".gitignore", ".travis.yml"}) or
-                    x == "_build" or
-                    x == "__pycache__")]
-
-    test_dir = Path(tempfile.mkdtemp()) / "naucse"
-    naucse = Path(__file__).parent.parent
-    shutil.copytree(naucse, str(test_dir), ignore=ignore)
-
-    repo = Repo(str(test_dir))
-    branch = "test_branch"
-    repo.create_head(branch)
-    getattr(repo.heads, branch).checkout()
-
-    # one working course
-    course_info = test_dir / "courses/test-course/info.yml"
-    course_info.parent.mkdir(exist_ok=True, parents=True)
-    course_info.write_text(yaml.dump(generate_course("Course title"), default_flow_style=False))
-
-    # one working run
-    run_info = test_dir / "runs/2018/test-run/info.yml"
-    run_info.parent.mkdir(exist_ok=True, parents=True)
-    run_info.write_text(yaml.dump(generate_run("Run title"), default_flow_style=False))
-
-    # commit everything
-    repo.git.add([str(course_info), str(run_info)])
-    repo.git.add(A=True)
-    repo.index.commit("Commited everything")
-
-    # a broken branch for error handling testing
-    branch = "test_broken_branch"
-    repo.create_head(branch)
-    getattr(repo.heads, branch).checkout()
-
-    course_broken_info = test_dir / "courses/test-broken-course/info.yml"
-    course_broken_info.parent.mkdir(exist_ok=True, parents=True)
-    course_broken_info.write_text(yaml.dump(generate_course("Broken course title"), default_flow_style=False))
-
-    run_broken_info = test_dir / "runs/2018/test-broken-run/info.yml"
-    run_broken_info.parent.mkdir(exist_ok=True, parents=True)
-    run_broken_info.write_text(yaml.dump(generate_run("Broken run title"), default_flow_style=False))
-
-    utils = test_dir / "naucse/utils" / "forks.py"
-    utils.write_text("")
-
-    repo.git.add([str(course_broken_info), str(run_broken_info), str(utils)])
-    repo.index.commit("Created duplicates in a different branch, but broke rendering")
-
-    yield f"file://{test_dir}"
-
-    shutil.rmtree(test_dir.parent)
-
+def module_client(model):
+    """Generate a client for testing endpoints, model will be used.
 
-@pytest.fixture(scope="module")
-def model(fork):
-    """Generate a Root instance with the courses and runs generated in ``fork``
+    The client is shared by all tests in this module, use ``client`` in tests.
     """
-    path = Path(__file__).parent / 'fixtures/test_content'
-    root = models.Root(path)
-
-    course = models.CourseLink(root, path / 'courses/test-course')
-    course.repo = fork
-    course.branch = 'test_branch'
-
-    course_broken = models.CourseLink(root, path / 'courses/test-broken-course')
-    course_broken.repo = fork
-    course_broken.branch = 'test_broken_branch'
-
-    run = models.CourseLink(root, path / 'runs/2018/test-run')
-    run.repo = fork
-    run.branch = 'test_branch'
-
-    run_broken = models.CourseLink(root, path / 'runs/2018/test-broken-run')
-    run_broken.repo = fork
-    run_broken.branch = 'test_broken_branch'
-
-    # so rendering still works
-    meta = models.Course(root, path / 'courses/normal-course')
-    meta.is_meta = True
-
-    # so no file operations are needed, override list of courses and runs as well
-
-    root.courses = OrderedDict([('test-course', course),
-                                ('test-broken-course', course_broken),
-                                ('meta', meta)])
-
-    run_year = models.RunYear(root, path / 'runs/2018')
-    run_year.runs = OrderedDict([
-        ("test-run", run),
-        ("test-broken-run", run_broken)
-    ])
-
-    root.run_years = OrderedDict([
-        (2018, run_year)
-    ])
-    root.runs = {(2018, "test-run"): run, (2018, "test-broken-run"): run_broken}
+    app.testing = True
 
-    return root
+    with mock.patch("naucse.views._cached_model", model):
+        yield app.test_client()
 
 
 @pytest.fixture
-def client(model, mocker):
-    """Generate a client for testing endpoints, model will be used.
+def client(model, module_client):
+    """Return the shared client for testing endpoints, with a fresh list of runs.
     """
     # these methods have the @reify decorator, however we need for them to be recalculated
     # so ``naucse.utils.views.forks_enabled`` can be tested
@@ -182,10 +34,7 @@ def client(model, mocker):
     if hasattr(model, "safe_run_years"):
         delattr(model, "safe_run_years")
 
-    mocker.patch("naucse.views._cached_model", model)
-    from naucse.views import app
-    app.testing = True
-    yield app.test_client()
+    return module_client
 
 
 def test_course_info(model):
@@ -219,10 +68,10 @@ def test_course_render(model):
     Also test that run pages (calendar) aren't rendered for non-run courses.
     """
     assert model.courses["test-course"].render_course()
-    with pytest.raises(BuildError):
+    with pytest.raises(NoCalendar):
         model.courses["test-course"].render_calendar()
 
-    with pytest.raises(BuildError):
+    with pytest.raises(NoCalendar):
         model.courses["test-course"].render_calendar_ics()
 
     assert model.courses["test-course"].render_session_coverpage("first-session", "front")
@@ -277,6 +126,19 @@ def test_run_render(model):
     assert index != solution
 
 
+def test_render_page_skip_footer(model):
+    """Test that the footer of a page can be left out, keeping the content
+    """
+    kwargs = {"request_url": "/course/test-course/beginners/cmdline/"}
+
+    result = model.courses["test-course"].render_page("beginners/cmdline", "index", None, **kwargs)
+    assert "footer" in result
+
+    result = model.courses["test-course"].render_page("beginners/cmdline", "index", None, skip_footer=True, **kwargs)
+    assert "footer" not in result
+    assert result["content"]
+
+
 def test_cache_offer(model):
     """Test that forks don't render content when content exists in cache.
     """
@@ -362,38 +224,45 @@ def test_runs_page_ignore_forks(mocker, client: FlaskClient):
     assert b"Run title" not in response.data
 
 
-@pytest.mark.parametrize("url", [
-    "/course/test-course/",
-    "/course/test-course/sessions/first-session/",
-    "/course/test-course/sessions/first-session/back/",
-    "/course/test-course/beginners/cmdline/",
-    "/course/test-course/beginners/cmdline/index/solutions/0/",
-    "/course/test-course/beginners/install/linux/",
-    "/2018/test-run/",
-    "/2018/test-run/calendar/",
-])
-def test_working_pages(url, client: FlaskClient):
+def test_working_pages(client: FlaskClient):
     """Test the rendering of the pages is working and not returning a warning.
     """
-    response = client.get(url)
-    assert b"alert alert-danger" not in response.data
-
-
-@pytest.mark.parametrize("url", [
-    "/course/test-broken-course/",
-    "/course/test-broken-course/sessions/first-session/",
-    "/course/test-broken-course/sessions/first-session/back/",
-    "/course/test-broken-course/beginners/cmdline/",
-    "/course/test-broken-course/beginners/cmdline/index/solutions/0/",
-    "/course/test-broken-course/beginners/install/linux/",
-    "/2018/test-broken-run/",
-    "/2018/test-broken-run/calendar/",
-])
-def test_failing_pages(url, client: FlaskClient):
+    for url in [
+        "/course/test-course/",
+        "/course/test-course/sessions/first-session/",
+        "/course/test-course/sessions/first-session/back/",
+        "/course/test-course/beginners/cmdline/",
+        "/course/test-course/beginners/cmdline/index/solutions/0/",
+        "/course/test-course/beginners/install/linux/",
+        "/2018/test-run/",
+        "/2018/test-run/calendar/",
+    ]:
+        response = client.get(url)
+        assert b"alert alert-danger" not in response.data, url
+
+
+def test_failing_pages(client: FlaskClient):
     """Test that a failing page renders as a page with an error message.
     """
-    response = client.get(url)
-    assert b"alert alert-danger" in response.data
+    for url in [
+        "/course/test-broken-course/",
+        "/course/test-broken-course/sessions/first-session/",
+        "/course/test-broken-course/sessions/first-session/back/",
+        "/course/test-broken-course/beginners/cmdline/",
+        "/course/test-broken-course/beginners/cmdline/index/solutions/0/",
+        "/course/test-broken-course/beginners/install/linux/",
+        "/2018/test-broken-run/",
+        "/2018/test-broken-run/calendar/",
+    ]:
+        response = client.get(url)
+        assert b"alert alert-danger" in response.data, url
+
+
+def test_course_calendar_not_found(client: FlaskClient):
+    """Test that linked courses, which don't have dates, don't have calendars.
+    """
+    assert client.get("/course/test-course/calendar/").status_code == 404
+    assert client.get("/course/test-course/calendar.ics").status_code == 404
 
 
 def test_get_footer_links(model):
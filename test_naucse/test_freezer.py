@@ -0,0 +1,19 @@
+from flask import Flask
+
+from naucse.freezer import AllLinksLogger, UrlsToFreeze
+
+
+def test_urls_to_freeze_yielded_once():
+    urls_to_freeze = UrlsToFreeze()
+    logger = AllLinksLogger(Flask(__name__), urls_to_freeze)
+
+    for url in "/2018/run/", "/static/style.css", "/2018/run/":
+        urls_to_freeze.append(url)
+
+    calls = logger.iter_calls()
+    assert next(calls) == "/2018/run/"
+
+    # URLs recorded again after they were yielded aren't queued either
+    urls_to_freeze.append("/2018/run/")
+
+    assert list(calls) == ["/static/style.css"]
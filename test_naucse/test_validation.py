@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 import naucse.validation
@@ -52,8 +54,21 @@ def test_allowed_styles():
         """
     )
 
+    # whitespace after the closing tag is passed to the style check as well
+    allowed_elements.reset_and_feed(
+        """
+        <div>
+            <style>
+            .dataframe td {
+                color: green;
+            }
+            </style>
+        </div>
+        """
+    )
+
     # valid styles, but wrong elements
-    with pytest.raises(naucse.validation.DisallowedStyle):
+    with pytest.raises(naucse.validation.DisallowedStyle) as excinfo:
         allowed_elements.reset_and_feed(
             """
             <style>
@@ -63,9 +78,10 @@ def test_allowed_styles():
             </style>
             """
         )
+    assert str(excinfo.value) == naucse.validation.DisallowedStyle.OUT_OF_SCOPE
 
-    # can't parse
-    with pytest.raises(naucse.validation.DisallowedStyle):
+    # can't parse, none of the selectors are allowed
+    with pytest.raises(naucse.validation.DisallowedStyle) as excinfo:
         allowed_elements.reset_and_feed(
             """
             <style>
@@ -74,6 +90,20 @@ def test_allowed_styles():
             </style>
             """
         )
+    assert str(excinfo.value) == naucse.validation.DisallowedStyle.OUT_OF_SCOPE
+
+    # can't parse
+    with pytest.raises(naucse.validation.DisallowedStyle) as excinfo:
+        allowed_elements.reset_and_feed(
+            """
+            <style>
+            .dataframe td[ {
+                color: red;
+            }
+            </style>
+            """
+        )
+    assert str(excinfo.value) == naucse.validation.DisallowedStyle.COULD_NOT_PARSE
 
     # multiple selectors in one rule
     # valid:
@@ -98,3 +128,72 @@ def test_allowed_styles():
             </style>
             """
         )
+
+
+@pytest.mark.parametrize("css", [
+    ".dataframe thead tr:only-child th { text-align: right; }",
+    ".dataframe .green, .dataframe .also-green { color: green; }\n.dataframe td { color: red; }",
+])
+def test_simple_styles(css):
+    """Styles made of plain ``.dataframe`` rules are allowed without parsing them.
+    """
+    allowed_elements = naucse.validation.AllowedElementsParser()
+
+    assert allowed_elements.is_simple_allowed_css(css)
+
+
+@pytest.mark.parametrize("css", [
+    # at-rules
+    "@import url(http://example.com/style.css);",
+    "@media print { .dataframe td { color: red; } }",
+    # comments
+    ".dataframe td { color: red; } /* comment */",
+    # selectors which aren't allowed
+    ".green { color: green; }",
+    ".dataframe td, .green { color: green; }",
+    # malformed
+    ".dataframe td[ { color: red }",
+    """.dataframe ))) "' { x }""",
+    '.dataframe a { c: "}',
+    ".dataframe td {color: red} .dataframe x] body {color:red}",
+    ".dataframe td { color: red( }",
+    ".dataframe td { color: [ }",
+    ".dataframe td { a: /* }",
+    ".dataframe td { ))) }",
+    ".dataframe td:::x { color: red }",
+    ".dataframe . { a: b }",
+])
+def test_styles_not_simple(css):
+    """Anything unusual is left for cssutils to check.
+    """
+    allowed_elements = naucse.validation.AllowedElementsParser()
+
+    assert not allowed_elements.is_simple_allowed_css(css)
+
+
+@pytest.mark.parametrize("css", [
+    ".dataframe td[ { color: red }",
+    """.dataframe ))) "' { x }""",
+    ".dataframe td {color: red} .dataframe x] body {color:red}",
+    ".dataframe td { color: red( }",
+    ".dataframe td { color: [ }",
+    ".dataframe td { a: /* }",
+    ".dataframe td { ))) }",
+    ".dataframe td:::x { color: red }",
+    ".dataframe . { a: b }",
+])
+def test_malformed_styles(css):
+    allowed_elements = naucse.validation.AllowedElementsParser()
+
+    with pytest.raises(naucse.validation.DisallowedStyle):
+        allowed_elements.reset_and_feed(f"<style>{css}</style>")
+
+
+def test_simple_styles_long_input():
+    """Long input which isn't a simple style is rejected quickly, it comes from forks.
+    """
+    allowed_elements = naucse.validation.AllowedElementsParser()
+
+    start = time.perf_counter()
+    assert not allowed_elements.is_simple_allowed_css(" " * 100000 + ".dataframe x;{")
+    assert time.perf_counter() - start < 1
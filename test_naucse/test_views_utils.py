@@ -1,6 +1,9 @@
 import datetime
+from pathlib import Path
 
 import pytest
+from arca.utils import get_hash_for_file
+from git import Repo
 
 import naucse.utils.views
 
@@ -20,6 +23,57 @@ import naucse.utils.views
          [(2016, 12), (2017, 1), (2017, 2), (2017, 3), (2017, 4), (2017, 5),
           (2017, 6), (2017, 7), (2017, 8), (2017, 9), (2017, 10), (2017, 11),
           (2017, 12), (2018, 1)]),
+        (datetime.date(2017, 1, 31), datetime.date(2017, 2, 1),
+         [(2017, 1), (2017, 2)]),
+        (datetime.date(2017, 2, 1), datetime.date(2017, 1, 31),
+         []),
     ])
 def test_list_months(start, end, expected):
     assert naucse.utils.views.list_months(start, end) == expected
+
+
+@pytest.fixture
+def lesson_tree_hash_cache(mocker):
+    """Start with empty caches of lesson tree hashes, with caching enabled.
+    """
+    mocker.patch("naucse.utils.views._caching_enabled", lambda: True)
+    mocker.patch("naucse.utils.views._lesson_tree_hash", {})
+    mocker.patch("naucse.utils.views._lesson_tree_hash_primed", set())
+    mocker.patch("naucse.utils.views._missing_lessons", set())
+
+
+def test_lesson_tree_hash(lesson_tree_hash_cache):
+    """Hashes of all lessons got at once are the same as the hashes of single lessons
+    """
+    repo = Repo(str(Path(__file__).parent.parent))
+
+    for lesson_slug in "beginners/cmdline", "beginners/install":
+        assert naucse.utils.views.get_lesson_tree_hash(repo, lesson_slug) == \
+            get_hash_for_file(repo, "lessons/" + lesson_slug)
+
+    assert repo.git_dir in naucse.utils.views._lesson_tree_hash_primed
+
+
+def test_lesson_tree_hash_missing_lesson(lesson_tree_hash_cache):
+    repo = Repo(str(Path(__file__).parent.parent))
+
+    # the second time it's already known the lesson doesn't exist
+    for _ in range(2):
+        with pytest.raises(FileNotFoundError):
+            naucse.utils.views.get_lesson_tree_hash(repo, "beginners/non-existing")
+
+    assert (repo.git_dir, "beginners/non-existing") in naucse.utils.views._missing_lessons
+
+
+def test_page_content_cache_key_vars(lesson_tree_hash_cache, mocker):
+    """Vars which are equal in Python, but not in JSON, give different keys
+    """
+    mocker.patch("naucse.utils.views._page_content_cache_keys", {})
+    repo = Repo(str(Path(__file__).parent.parent))
+
+    keys = {
+        naucse.utils.views.page_content_cache_key(repo, "beginners/cmdline", "index", None, course_vars)
+        for course_vars in ({"x": True}, {"x": 1}, {"x": 1.0})
+    }
+
+    assert len(keys) == 3